@@ -3,326 +3,534 @@
 import ast
 import base64
 import collections
+import functools
 import io
 import os
-import sys
+import re
 import tempfile
+import threading
 import traceback
+from contextlib import redirect_stdout
+from types import CodeType, ModuleType
 from typing import Any, Dict, List, Optional, Tuple
 
-import matplotlib
-matplotlib.use('Agg')  # Set backend before importing pyplot
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 from mcp.server.fastmcp import FastMCP
 from RestrictedPython import compile_restricted
 import warnings
 
 # Suppress matplotlib warnings
 warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib')
-plt.style.use('default')
+
+# Formatting tracebacks walks every frame, so only do it when asked to
+INCLUDE_TRACEBACK = os.environ.get('MCP_INCLUDE_TRACEBACK', '').lower() in (
+    '1', 'true', 'yes'
+)
+
+# Resolution of returned plots
+PLOT_DPI = int(os.environ.get('MCP_PLOT_DPI', '100'))
 
 mcp = FastMCP("Python Data Visualization Server")
 
 
+_ALLOWED_MODULES = frozenset({
+    # Core data analysis
+    "numpy",
+    "np",
+    "pandas",
+    "pd",
+    "matplotlib",
+    "matplotlib.pyplot",
+    "plt",
+    "seaborn",
+    "sns",
+    "scipy",
+    "sklearn",
+    "plotly",
+
+    # Built-in Python modules
+    "math",
+    "statistics",
+    "random",
+    "datetime",
+    "json",
+    "collections",
+    "itertools",
+    "functools",
+    "operator",
+    "re",
+    "string",
+    "decimal",
+    "fractions",
+    "warnings",
+    "copy",
+    "io",
+    "os",
+    "sys",
+    "time",
+    "calendar",
+    "typing",
+    "enum",
+    "dataclasses",
+    "pathlib",
+    "tempfile",
+    "array",
+    "bisect",
+    "heapq",
+    "base64",
+    "binascii",
+    "struct",
+    "hashlib",
+    "uuid",
+    "logging",
+
+    # Data processing
+    "csv",
+    "pickle",
+    "gzip",
+    "zipfile",
+    "tarfile",
+    "configparser",
+
+    # Text processing
+    "textwrap",
+    "unicodedata",
+    "codecs",
+
+    # File operations
+    "glob",
+    "fnmatch",
+    "shutil",
+    "filecmp",
+
+    # Network (limited safe modules)
+    "urllib",
+    "http",
+    "email",
+    "mimetypes",
+    "html",
+    "xml",
+})
+
+# Packages whose submodules may be imported as well
+_ALLOWED_PREFIXES = (
+    "matplotlib.",
+    "numpy.",
+    "pandas.",
+    "scipy.",
+    "sklearn.",
+    "plotly.",
+)
+
+_DANGEROUS_FUNCTIONS = frozenset({
+    "exec",
+    "eval",
+    "compile",
+    "__import__",
+    "open",
+    "file",
+    "input",
+    "raw_input",
+    "reload",
+    "vars",
+    "locals",
+    "globals",
+    "dir",
+    "hasattr",
+    "getattr",
+    "setattr",
+    "delattr",
+    "isinstance",
+    "issubclass",
+    "callable",
+    "type",
+    "__builtins__",
+})
+
+_DANGEROUS_NODES = frozenset({
+    ast.Import,
+    ast.ImportFrom,
+    ast.AsyncFunctionDef,
+    ast.ClassDef,
+    ast.AsyncWith,
+    ast.Raise,
+    ast.Assert,
+    ast.Delete,
+    ast.Global,
+    ast.Nonlocal,
+})
+
+_DANGEROUS_ATTRS = frozenset({
+    '__class__',
+    '__bases__',
+    '__subclasses__',
+    '__mro__',
+    # Function and module internals that reach unrestricted globals or builtins
+    '__globals__',
+    '__code__',
+    '__builtins__',
+})
+
+
 class SafeCodeValidator:
-    """Validates Python code for safe execution."""
-
-    ALLOWED_MODULES = {
-        # Core data analysis
-        "numpy",
-        "np",
-        "pandas",
-        "pd",
-        "matplotlib",
-        "matplotlib.pyplot",
-        "plt",
-        "seaborn",
-        "sns",
-        "scipy",
-        "sklearn",
-        "plotly",
-        
-        # Built-in Python modules
-        "math",
-        "statistics",
-        "random",
-        "datetime",
-        "json",
-        "collections",
-        "itertools",
-        "functools",
-        "operator",
-        "re",
-        "string",
-        "decimal",
-        "fractions",
-        "warnings",
-        "copy",
-        "io",
-        "os",
-        "sys",
-        "time",
-        "calendar",
-        "typing",
-        "enum",
-        "dataclasses",
-        "pathlib",
-        "tempfile",
-        "array",
-        "bisect",
-        "heapq",
-        "base64",
-        "binascii",
-        "struct",
-        "hashlib",
-        "uuid",
-        "logging",
-        
-        # Data processing
-        "csv",
-        "pickle",
-        "gzip",
-        "zipfile",
-        "tarfile",
-        "configparser",
-        
-        # Text processing
-        "textwrap",
-        "unicodedata",
-        "codecs",
-        
-        # File operations
-        "glob",
-        "fnmatch",
-        "shutil",
-        "filecmp",
-        
-        # Network (limited safe modules)
-        "urllib",
-        "http",
-        "email",
-        "mimetypes",
-        "html",
-        "xml",
-    }
+    """Validates Python code for safe execution.
 
-    DANGEROUS_FUNCTIONS = {
-        "exec",
-        "eval",
-        "compile",
-        "__import__",
-        "open",
-        "file",
-        "input",
-        "raw_input",
-        "reload",
-        "vars",
-        "locals",
-        "globals",
-        "dir",
-        "hasattr",
-        "getattr",
-        "setattr",
-        "delattr",
-        "isinstance",
-        "issubclass",
-        "callable",
-        "type",
-        "__builtins__",
-    }
+    The validator holds no per-call state; all checks are static and
+    validate_code never instantiates the class.
+    """
+
+    __slots__ = ()
+
+    ALLOWED_MODULES = _ALLOWED_MODULES
+    DANGEROUS_FUNCTIONS = _DANGEROUS_FUNCTIONS
+    DANGEROUS_NODES = _DANGEROUS_NODES
+    DANGEROUS_ATTRS = _DANGEROUS_ATTRS
 
-    DANGEROUS_NODES = {
-        ast.Import,
-        ast.ImportFrom,
-        ast.FunctionDef,
-        ast.AsyncFunctionDef,
-        ast.ClassDef,
-        ast.With,
-        ast.AsyncWith,
-        ast.Try,
-        ast.ExceptHandler,
-        ast.Raise,
-        ast.Assert,
-        ast.Delete,
-        ast.Global,
-        ast.Nonlocal,
-    }
-    
     @classmethod
-    def validate_code(cls, code: str) -> Tuple[bool, Optional[str]]:
-        """Validate if code is safe to execute."""
+    def validate_code(
+        cls, code: str
+    ) -> Tuple[bool, Optional[str], Optional[ast.Module]]:
+        """Validate if code is safe to execute.
+
+        The parsed tree is returned as well so callers can compile it
+        without parsing the source a second time.
+        """
         try:
             tree = ast.parse(code)
         except SyntaxError as e:
-            return False, f"Syntax error: {e}"
+            return False, f"Syntax error: {e}", None
+
+        # Every check needs a tell-tale token in the source, so code without any
+        # can skip the walk. Non-ASCII code always gets the full walk because
+        # identifiers are NFKC-normalized by the parser.
+        if code.isascii() and _HAZARD_PATTERN.search(code) is None:
+            return True, None, tree
         
-        validator = cls()
         try:
-            validator.visit(tree)
-            return True, None
+            cls.visit(tree)
+            return True, None, tree
         except ValueError as e:
-            return False, str(e)
+            return False, str(e), None
     
-    def visit(self, node: ast.AST) -> None:
-        """Visit AST nodes and check for dangerous patterns."""
-        if type(node) in self.DANGEROUS_NODES:
-            if isinstance(node, (ast.Import, ast.ImportFrom)):
-                self._check_import(node)
+    @classmethod
+    def visit(cls, node: ast.AST) -> None:
+        """Walk the AST iteratively and check for dangerous patterns.
+
+        Names and attributes make up most checked nodes, so they are tested
+        inline with everything bound to locals; other types go through DISPATCH.
+        """
+        dispatch = cls.DISPATCH
+        skip = cls.SKIP_TYPES
+        dangerous_functions = _DANGEROUS_FUNCTIONS
+        dangerous_attrs = _DANGEROUS_ATTRS
+        name_type = ast.Name
+        attribute_type = ast.Attribute
+        iter_child_nodes = ast.iter_child_nodes
+        work = [node]
+        pop = work.pop
+        extend = work.extend
+        while work:
+            node = pop()
+            node_type = type(node)
+            if node_type is name_type:
+                if node.id in dangerous_functions:
+                    raise ValueError(f"Dangerous function: {node.id}")
+                continue
+            if node_type is attribute_type:
+                # Attribute names are interned with a cached hash, so the
+                # frozenset probe is cheaper than a '__' prefix test before it.
+                if node.attr in dangerous_attrs:
+                    raise ValueError(f"Dangerous attribute access: {node.attr}")
             else:
-                raise ValueError(f"Dangerous node type: {type(node).__name__}")
-        
-        if isinstance(node, ast.Name):
-            self._check_name(node)
-        elif isinstance(node, ast.Call):
-            self._check_call(node)
-        elif isinstance(node, ast.Attribute):
-            self._check_attribute(node)
-        
-        for child in ast.iter_child_nodes(node):
-            self.visit(child)
+                handler = dispatch.get(node_type)
+                if handler is not None:
+                    handler(node)
+            if node_type not in skip:
+                extend(iter_child_nodes(node))
     
-    def _check_import(self, node) -> None:
+    @staticmethod
+    def _reject_node(node: ast.AST) -> None:
+        """Reject a node type that is never allowed."""
+        raise ValueError(f"Dangerous node type: {type(node).__name__}")
+
+    @staticmethod
+    def _check_import(node: ast.Import) -> None:
         """Check if import is allowed."""
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                if not self._is_module_allowed(alias.name):
-                    raise ValueError(f"Import not allowed: {alias.name}")
-        elif isinstance(node, ast.ImportFrom):
-            if node.module and not self._is_module_allowed(node.module):
-                raise ValueError(f"Import not allowed: {node.module}")
+        for alias in node.names:
+            if not SafeCodeValidator._is_module_allowed(alias.name):
+                raise ValueError(f"Import not allowed: {alias.name}")
+
+    @staticmethod
+    def _check_import_from(node: ast.ImportFrom) -> None:
+        """Check if from-import is allowed."""
+        if node.module and not SafeCodeValidator._is_module_allowed(node.module):
+            raise ValueError(f"Import not allowed: {node.module}")
+
+    @staticmethod
+    def _check_with(node: ast.With) -> None:
+        """Check that every context manager is created by a call."""
+        for item in node.items:
+            if not isinstance(item.context_expr, ast.Call):
+                raise ValueError("Context manager must be created by a function call")
     
-    def _is_module_allowed(self, module_name: str) -> bool:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _is_module_allowed(module_name: str) -> bool:
         """Check if a module name is allowed, including submodules."""
-        if module_name in self.ALLOWED_MODULES:
-            return True
+        return (
+            module_name in _ALLOWED_MODULES
+            or module_name.startswith(_ALLOWED_PREFIXES)
+        )
+    
+    # Checks for node types not handled inline in visit, looked up once per node
+    # instead of an isinstance chain. Dangerous nodes without a dedicated check
+    # map to _reject_node. Calls need no check of their own: a call to a
+    # dangerous function is caught when its func Name is visited.
+    DISPATCH = {
+        **dict.fromkeys(_DANGEROUS_NODES, _reject_node),
+        ast.Import: _check_import,
+        ast.ImportFrom: _check_import_from,
+        ast.With: _check_with,
+    }
 
-        # Allow matplotlib submodules
-        if module_name.startswith("matplotlib."):
-            return True
+    # Nodes whose children can never be dangerous: literals, expression contexts,
+    # operators, import aliases, and names (whose only child is a context). Their
+    # subtrees are not pushed onto the work stack. ast.arguments and ast.arg are
+    # deliberately absent since defaults and annotations may hold calls.
+    SKIP_TYPES = frozenset({
+        ast.Constant,
+        ast.Name,
+        ast.alias,
+        ast.Load,
+        ast.Store,
+        ast.Del,
+        *ast.operator.__subclasses__(),
+        *ast.unaryop.__subclasses__(),
+        *ast.cmpop.__subclasses__(),
+        *ast.boolop.__subclasses__(),
+    })
 
-        # Allow numpy submodules
-        if module_name.startswith("numpy."):
-            return True
 
-        # Allow pandas submodules
-        if module_name.startswith("pandas."):
-            return True
+# Keyword that must appear in the source for each node type with a check
+_NODE_KEYWORDS = {
+    ast.Import: 'import',
+    ast.ImportFrom: 'import',
+    ast.AsyncFunctionDef: 'async',
+    ast.ClassDef: 'class',
+    ast.With: 'with',
+    ast.AsyncWith: 'async',
+    ast.Raise: 'raise',
+    ast.Assert: 'assert',
+    ast.Delete: 'del',
+    ast.Global: 'global',
+    ast.Nonlocal: 'nonlocal',
+}
 
-        return False
-    
-    def _check_name(self, node: ast.Name) -> None:
-        """Check if name access is dangerous."""
-        if node.id in self.DANGEROUS_FUNCTIONS:
-            raise ValueError(f"Dangerous function: {node.id}")
-    
-    def _check_call(self, node: ast.Call) -> None:
-        """Check if function call is dangerous."""
-        if isinstance(node.func, ast.Name):
-            if node.func.id in self.DANGEROUS_FUNCTIONS:
-                raise ValueError(f"Dangerous function call: {node.func.id}")
-    
-    def _check_attribute(self, node: ast.Attribute) -> None:
-        """Check if attribute access is dangerous."""
-        dangerous_attrs = {'__class__', '__bases__', '__subclasses__', '__mro__'}
-        if node.attr in dangerous_attrs:
-            raise ValueError(f"Dangerous attribute access: {node.attr}")
+# Matches any token that could make the validator reject code: a keyword from
+# the dispatch table, a dangerous name, or a double underscore (all dangerous
+# attributes and dunder names). Built from the validator's own tables, so a
+# node type added to DISPATCH without a keyword fails at import time.
+_HAZARD_PATTERN = re.compile(
+    r'__|\b(?:'
+    + '|'.join(sorted(
+        {_NODE_KEYWORDS[node_type] for node_type in SafeCodeValidator.DISPATCH}
+        | {name for name in _DANGEROUS_FUNCTIONS if '__' not in name}
+    ))
+    + r')\b'
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _prepare_code(code: str) -> Tuple[Optional[CodeType], Optional[str]]:
+    """Validate and compile code, caching the result for repeated submissions.
+
+    Returns the code object, or None and the reason the code was rejected.
+    """
+    is_safe, error, tree = SafeCodeValidator.validate_code(code)
+    if not is_safe:
+        return None, error
+    try:
+        return compile(tree, '<mcp>', 'exec'), None
+    except SyntaxError as e:
+        return None, f"Syntax error: {e}"
+
+
+# Execution namespace shared by every run; built once at import time.
+# pandas and matplotlib are added by _load_plotting_stack() on first execute.
+_SAFE_GLOBALS = {
+    '__builtins__': {
+        'len': len, 'range': range, 'enumerate': enumerate,
+        'zip': zip, 'map': map, 'filter': filter, 'sum': sum,
+        'min': min, 'max': max, 'abs': abs, 'round': round,
+        'sorted': sorted, 'reversed': reversed, 'all': all, 'any': any,
+        'str': str, 'int': int, 'float': float, 'bool': bool,
+        'list': list, 'dict': dict, 'tuple': tuple, 'set': set,
+        'print': print, 'ValueError': ValueError, 'TypeError': TypeError,
+        'IndexError': IndexError, 'KeyError': KeyError, 'Exception': Exception,
+        '__import__': __import__,  # Add __import__ for import statements
+    },
+    'np': np,
+    'numpy': np,
+    'collections': collections,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _load_plotting_stack() -> ModuleType:
+    """Import matplotlib and pandas on first use and return pyplot.
+
+    Both take around a second and a few hundred MB to import, so servers
+    that never run code do not pay for them.
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # Set backend before importing pyplot
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    plt.style.use('default')
+    plt.ioff()
+    _SAFE_GLOBALS.update({
+        'pd': pd,
+        'pandas': pd,
+        'plt': plt,
+        'matplotlib': matplotlib,
+    })
+    return plt
+
+
+_thread_state = threading.local()
+
+
+def _stdout_buffer() -> io.StringIO:
+    """Return this thread's stdout capture buffer, emptied for reuse."""
+    buffer = getattr(_thread_state, 'stdout_buffer', None)
+    if buffer is None:
+        buffer = _thread_state.stdout_buffer = io.StringIO()
+    else:
+        buffer.seek(0)
+        buffer.truncate()
+    return buffer
 
 
 class SafeExecutor:
     """Executes Python code safely with restricted environment."""
+
+    __slots__ = ('dpi', 'safe_globals')
     
-    def __init__(self):
-        self.safe_globals = {
-            '__builtins__': {
-                'len': len, 'range': range, 'enumerate': enumerate,
-                'zip': zip, 'map': map, 'filter': filter, 'sum': sum,
-                'min': min, 'max': max, 'abs': abs, 'round': round,
-                'sorted': sorted, 'reversed': reversed, 'all': all, 'any': any,
-                'str': str, 'int': int, 'float': float, 'bool': bool,
-                'list': list, 'dict': dict, 'tuple': tuple, 'set': set,
-                'print': print, 'ValueError': ValueError, 'TypeError': TypeError,
-                'IndexError': IndexError, 'KeyError': KeyError,
-                '__import__': __import__,  # Add __import__ for import statements
-            },
-            'np': np,
-            'numpy': np,
-            'pd': pd,
-            'pandas': pd,
-            'plt': plt,
-            'matplotlib': matplotlib,
-            'collections': collections,
-        }
+    def __init__(self, dpi: int = PLOT_DPI):
+        self.dpi = dpi
+        self.safe_globals = _SAFE_GLOBALS
     
-    def execute(self, code: str) -> Dict[str, Any]:
-        """Execute code safely and return results."""
-        is_safe, error = SafeCodeValidator.validate_code(code)
-        if not is_safe:
+    def execute(self, code: str, include_variables: bool = True) -> Dict[str, Any]:
+        """Execute code safely and return results.
+
+        Stringifying every user variable can be costly for large objects, so
+        callers that ignore them can pass include_variables=False.
+        """
+        code_obj, error = _prepare_code(code)
+        if code_obj is None:
             return {'success': False, 'error': f'Code validation failed: {error}'}
+
+        plt = _load_plotting_stack()
         
         try:
-            local_vars = {}
-            
-            old_stdout = sys.stdout
-            stdout_buffer = io.StringIO()
-            sys.stdout = stdout_buffer
-            
-            fig_buffer = io.BytesIO()
-            plt.ioff()
+            # A single namespace, so functions defined by the code can see
+            # its top-level names
+            namespace = dict(self.safe_globals)
+            stdout_buffer = _stdout_buffer()
             
             try:
-                exec(code, self.safe_globals, local_vars)
+                with redirect_stdout(stdout_buffer):
+                    exec(code_obj, namespace)
                 
                 output = stdout_buffer.getvalue()
                 
                 plot_data = None
                 if plt.get_fignums():
-                    plt.savefig(fig_buffer, format='png', bbox_inches='tight', dpi=150)
-                    fig_buffer.seek(0)
-                    plot_data = base64.b64encode(fig_buffer.read()).decode('utf-8')
-                    plt.close('all')
+                    # Render the current figure once through the Agg canvas;
+                    # bbox_inches='tight' would cost an extra draw to measure it.
+                    fig = plt.gcf()
+                    fig.set_dpi(self.dpi)
+                    fig.tight_layout()
+                    fig_buffer = io.BytesIO()
+                    fig.canvas.print_png(fig_buffer)
+                    plot_data = base64.b64encode(fig_buffer.getbuffer()).decode('ascii')
                 
+                variables = {}
+                if include_variables:
+                    variables = {k: str(v) for k, v in namespace.items()
+                                 if not k.startswith('_')
+                                 and k not in self.safe_globals}
+
                 return {
                     'success': True,
                     'output': output,
                     'plot': plot_data,
-                    'variables': {k: str(v) for k, v in local_vars.items() 
-                                if not k.startswith('_')}
+                    'variables': variables
                 }
             
             finally:
-                sys.stdout = old_stdout
                 plt.close('all')
                 
         except Exception as e:
-            return {
+            result = {
                 'success': False,
                 'error': f'{type(e).__name__}: {str(e)}',
-                'traceback': traceback.format_exc()
             }
+            if INCLUDE_TRACEBACK:
+                result['traceback'] = traceback.format_exc()
+            return result
 
 
 executor = SafeExecutor()
 
 
 @mcp.tool()
-def execute_python(code: str) -> Dict[str, Any]:
+def execute_python(code: str, include_variables: bool = True) -> Dict[str, Any]:
     """
     Execute Python code safely with numpy, pandas, and matplotlib.
     
     Args:
         code: Python code to execute (string)
+        include_variables: Whether to return the variables created (default True)
         
     Returns:
         Dictionary containing:
         - success: Boolean indicating if execution succeeded
         - output: Printed output from the code
         - plot: Base64 encoded PNG plot (if matplotlib was used)
-        - variables: Dictionary of variables created
+        - variables: Dictionary of variables created (empty if not requested)
         - error: Error message (if success is False)
     """
-    return executor.execute(code)
+    return executor.execute(code, include_variables)
+
+
+# Constant response, built once at import time
+_FUNCTIONS_RESPONSE = {
+    'numpy': [
+        'np.array()', 'np.arange()', 'np.linspace()', 'np.zeros()', 'np.ones()',
+        'np.mean()', 'np.std()', 'np.sum()', 'np.min()', 'np.max()',
+        'np.sin()', 'np.cos()', 'np.exp()', 'np.log()', 'np.sqrt()'
+    ],
+    'pandas': [
+        'pd.DataFrame()', 'pd.Series()', 'pd.read_csv()', 'pd.concat()',
+        '.head()', '.tail()', '.describe()', '.info()', '.groupby()',
+        '.sort_values()', '.drop()', '.fillna()', '.isnull()'
+    ],
+    'matplotlib': [
+        'plt.plot()', 'plt.scatter()', 'plt.bar()', 'plt.hist()',
+        'plt.xlabel()', 'plt.ylabel()', 'plt.title()', 'plt.legend()',
+        'plt.figure()', 'plt.subplot()', 'plt.show()', 'plt.savefig()'
+    ],
+    'collections': [
+        'collections.Counter()', 'collections.defaultdict()', 'collections.deque()',
+        'collections.OrderedDict()', 'collections.namedtuple()', 'collections.ChainMap()'
+    ],
+    'builtin': [
+        'print()', 'len()', 'sum()', 'min()', 'max()', 'sorted()',
+        'range()', 'enumerate()', 'zip()', 'map()', 'filter()'
+    ]
+}
 
 
 @mcp.tool()
@@ -333,42 +541,11 @@ def list_available_functions() -> Dict[str, List[str]]:
     Returns:
         Dictionary with available functions organized by category
     """
-    return {
-        'numpy': [
-            'np.array()', 'np.arange()', 'np.linspace()', 'np.zeros()', 'np.ones()',
-            'np.mean()', 'np.std()', 'np.sum()', 'np.min()', 'np.max()',
-            'np.sin()', 'np.cos()', 'np.exp()', 'np.log()', 'np.sqrt()'
-        ],
-        'pandas': [
-            'pd.DataFrame()', 'pd.Series()', 'pd.read_csv()', 'pd.concat()',
-            '.head()', '.tail()', '.describe()', '.info()', '.groupby()',
-            '.sort_values()', '.drop()', '.fillna()', '.isnull()'
-        ],
-        'matplotlib': [
-            'plt.plot()', 'plt.scatter()', 'plt.bar()', 'plt.hist()',
-            'plt.xlabel()', 'plt.ylabel()', 'plt.title()', 'plt.legend()',
-            'plt.figure()', 'plt.subplot()', 'plt.show()', 'plt.savefig()'
-        ],
-        'collections': [
-            'collections.Counter()', 'collections.defaultdict()', 'collections.deque()',
-            'collections.OrderedDict()', 'collections.namedtuple()', 'collections.ChainMap()'
-        ],
-        'builtin': [
-            'print()', 'len()', 'sum()', 'min()', 'max()', 'sorted()',
-            'range()', 'enumerate()', 'zip()', 'map()', 'filter()'
-        ]
-    }
+    return _FUNCTIONS_RESPONSE
 
 
-@mcp.tool()
-def create_sample_data() -> Dict[str, Any]:
-    """
-    Generate sample data for testing visualizations.
-    
-    Returns:
-        Dictionary with formatted Python code and metadata
-    """
-    code = """# Sample datasets you can use:
+# Constant response, built once at import time
+_SAMPLE_DATA_CODE = """# Sample datasets you can use:
 
 # 1. Simple numeric data
 x = np.linspace(0, 10, 100)
@@ -395,18 +572,29 @@ ts_data = pd.DataFrame({
 # plt.plot(x, y)
 # plt.scatter(data[:, 0], data[:, 1])
 # df.plot.scatter(x='x', y='y', c='category', colormap='viridis')"""
+
+_SAMPLE_DATA_RESPONSE = {
+    'success': True,
+    'code': _SAMPLE_DATA_CODE,
+    'description': 'Sample Python code for creating test datasets and visualizations',
+    'examples': [
+        'Simple numeric data with sine wave',
+        'Random scatter plot data',
+        'Pandas DataFrame with categories',
+        'Time series data'
+    ]
+}
+
+
+@mcp.tool()
+def create_sample_data() -> Dict[str, Any]:
+    """
+    Generate sample data for testing visualizations.
     
-    return {
-        'success': True,
-        'code': code,
-        'description': 'Sample Python code for creating test datasets and visualizations',
-        'examples': [
-            'Simple numeric data with sine wave',
-            'Random scatter plot data',
-            'Pandas DataFrame with categories',
-            'Time series data'
-        ]
-    }
+    Returns:
+        Dictionary with formatted Python code and metadata
+    """
+    return _SAMPLE_DATA_RESPONSE
 
 
 if __name__ == "__main__":